@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class CrmConfig(AppConfig):
+    name = 'crm'
+
+    def ready(self):
+        # Publish model changes to GraphQL subscribers
+        from .signals import connect_signals
+        connect_signals()
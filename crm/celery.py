@@ -1,5 +1,12 @@
 import os
 from celery import Celery
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+)
 
 # Set the default Django settings module for the 'celery' program
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crm.settings')
@@ -35,3 +42,61 @@ app.conf.update(
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
+
+
+@worker_init.connect
+def prefork_warm_up(**kwargs):
+    """
+    Import the schema and precompile fixed queries in the parent before forking.
+    """
+    from .warmup import warm_up_worker
+    warm_up_worker()
+
+
+@worker_process_init.connect
+def init_worker_connections(**kwargs):
+    """
+    Set up persistent DB connections and the shared GraphQL session per worker process.
+    """
+    from .connections import init_process_connections
+    from .warmup import record_process_start
+    init_process_connections()
+    record_process_start()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_connections(**kwargs):
+    """
+    Close the worker process' connections and log its reuse counters.
+    """
+    from .connections import close_process_connections
+    close_process_connections()
+
+
+@task_prerun.connect
+def record_task_connections(**kwargs):
+    """
+    Snapshot open database connections so reuse can be counted after the task.
+    """
+    from .connections import record_task_start
+    from .warmup import record_task_start as record_warmup_task_start
+    record_task_start()
+    record_warmup_task_start()
+
+
+@task_postrun.connect
+def record_task_connection_reuse(**kwargs):
+    """
+    Count whether the task reused its database connections.
+    """
+    from .connections import record_task_finished
+    record_task_finished()
+
+
+@task_postrun.connect
+def record_task_timing(**kwargs):
+    """
+    Measure first-task latency and memory of each worker process.
+    """
+    from .warmup import record_task_finished
+    record_task_finished()
@@ -0,0 +1,54 @@
+"""
+GraphQL client helpers that batch co-scheduled operations into one HTTP request.
+"""
+
+from .connections import (
+    DEFAULT_GRAPHQL_ENDPOINT,
+    get_crm_setting,
+    get_http_session,
+    record_graphql_batch,
+)
+
+
+def _post(payload, timeout):
+    return get_http_session().post(
+        get_crm_setting('GRAPHQL_ENDPOINT', DEFAULT_GRAPHQL_ENDPOINT),
+        json=payload,
+        timeout=timeout,
+    )
+
+
+def execute_batch(operations, timeout=30):
+    """
+    Send GraphQL operations to the CRM endpoint in as few requests as possible.
+
+    ``operations`` is a list of ``(query, variables)`` tuples (variables may be
+    None). Returns one ``{'data': ..., 'errors': ...}`` dict per operation, in
+    the same order. Several operations go out as a single JSON array; if the
+    endpoint does not accept batches they are sent one by one instead.
+    Raises on transport errors so callers can log them.
+
+    A batch the server answered with one result per operation is never
+    resent, whatever its HTTP status: graphene-django reports the worst
+    status of the batch, and the other operations (including mutations)
+    have already run. Failed operations carry their own ``errors``.
+    """
+    payload = []
+    for query, variables in operations:
+        operation = {'query': query}
+        if variables:
+            operation['variables'] = variables
+        payload.append(operation)
+
+    if len(payload) > 1:
+        response = _post(payload, timeout)
+        try:
+            results = response.json()
+        except ValueError:
+            results = None
+        if isinstance(results, list) and len(results) == len(payload):
+            record_graphql_batch()
+            return results
+
+    # Single operation, or an endpoint without batch support
+    return [_post(operation, timeout).json() for operation in payload]
@@ -0,0 +1,166 @@
+"""
+Per-process connection management for CRM Celery workers and cron jobs.
+
+Each worker process keeps persistent, health-checked database connections,
+one keep-alive GraphQL HTTP session, and records per-task connection reuse
+counters.
+"""
+
+import logging
+import threading
+from django.conf import settings
+from django.db import connections as db_connections
+import requests
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRAPHQL_ENDPOINT = 'http://localhost:8000/graphql'
+
+# Per-process shared state, reset in every forked worker process
+_lock = threading.Lock()
+_http_session = None
+_task_db_snapshot = {}
+
+_stats = {
+    'tasks': 0,
+    'db_connections_reused': 0,
+    'db_connections_opened': 0,
+    'graphql_sessions_opened': 0,
+    'graphql_requests': 0,
+    'graphql_batches': 0,
+}
+
+
+def get_crm_setting(key, default):
+    """
+    Read a value from settings.CRM_SETTINGS, falling back to a default.
+    """
+    if hasattr(settings, 'CRM_SETTINGS') and key in settings.CRM_SETTINGS:
+        return settings.CRM_SETTINGS[key]
+    return default
+
+
+def configure_persistent_db_connections():
+    """
+    Enable persistent, health-checked connections on every configured database.
+    Django then reuses a connection across tasks until it is older than
+    CONN_MAX_AGE or fails its health check, and recycles it otherwise.
+    """
+    max_age = get_crm_setting('DB_CONN_MAX_AGE', 600)
+    health_checks = get_crm_setting('DB_CONN_HEALTH_CHECKS', True)
+
+    for alias in db_connections:
+        connection = db_connections[alias]
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+
+def init_process_connections():
+    """
+    Set up connections for a freshly started (or forked) worker process.
+    Database handles inherited from the parent are left to Celery's Django
+    fixup, which discards them without closing the parent's sockets.
+    """
+    global _http_session
+
+    with _lock:
+        # Never reuse sockets inherited across fork
+        _http_session = None
+        _task_db_snapshot.clear()
+        for key in _stats:
+            _stats[key] = 0
+
+    configure_persistent_db_connections()
+    logger.info("Worker process connections initialized")
+
+
+def close_process_connections():
+    """
+    Close every connection owned by this process and log the final counters.
+    """
+    global _http_session
+
+    logger.info(f"Worker process connection stats: {get_connection_stats()}")
+
+    with _lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+
+    db_connections.close_all()
+
+
+def get_http_session():
+    """
+    Return the keep-alive HTTP session this process uses for GraphQL requests.
+    A plain requests session needs no schema introspection round-trip, so a
+    fresh cron process goes straight to its (batched) request.
+    """
+    global _http_session
+
+    with _lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            _stats['graphql_sessions_opened'] += 1
+        _stats['graphql_requests'] += 1
+        return _http_session
+
+
+def record_graphql_batch():
+    """
+    Count one batched GraphQL request.
+    """
+    with _lock:
+        _stats['graphql_batches'] += 1
+
+
+def reset_http_session():
+    """
+    Discard the shared HTTP session, e.g. after a connection error,
+    so the next request opens a fresh one.
+    """
+    global _http_session
+
+    with _lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+
+
+def record_task_start():
+    """
+    Remember which database connection objects are open as the task starts.
+    Expired or unusable ones may still be recycled before the task runs, so
+    reuse is only decided once the task has finished.
+    """
+    with _lock:
+        _task_db_snapshot.clear()
+        for connection in db_connections.all():
+            _task_db_snapshot[connection.alias] = connection.connection
+
+
+def record_task_finished():
+    """
+    Count each database connection the task used as reused or newly opened.
+    A connection is reused only if it is the same object that was open
+    before the task started.
+    """
+    with _lock:
+        _stats['tasks'] += 1
+        for connection in db_connections.all():
+            if connection.connection is None:
+                continue
+            if connection.connection is _task_db_snapshot.get(connection.alias):
+                _stats['db_connections_reused'] += 1
+            else:
+                _stats['db_connections_opened'] += 1
+        _task_db_snapshot.clear()
+
+
+def get_connection_stats():
+    """
+    Return a snapshot of this process' connection reuse counters.
+    """
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,129 @@
+"""
+WebSocket consumer serving GraphQL subscriptions over the graphql-transport-ws protocol.
+"""
+
+import asyncio
+import json
+import logging
+from channels.generic.websocket import AsyncWebsocketConsumer
+from graphql import GraphQLError, parse, subscribe, validate
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PROTOCOL = 'graphql-transport-ws'
+
+
+class GraphQLSubscriptionConsumer(AsyncWebsocketConsumer):
+    """
+    Run each subscribe message as a task streaming results back as "next" messages.
+    Only authenticated users may connect; each subscription field checks the
+    view permission of its model.
+    """
+
+    async def connect(self):
+        self.initialized = False
+        self.operations = {}
+        if PROTOCOL not in self.scope.get('subprotocols', []):
+            await self.close(code=4406)
+            return
+        await self.accept(subprotocol=PROTOCOL)
+
+    async def disconnect(self, code):
+        for task in self.operations.values():
+            task.cancel()
+        self.operations = {}
+
+    async def send_json(self, message):
+        await self.send(text_data=json.dumps(message))
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or '')
+            message_type = message['type']
+        except (ValueError, KeyError, TypeError):
+            await self.close(code=4400)
+            return
+
+        if message_type == 'connection_init':
+            if self.initialized:
+                await self.close(code=4429)
+                return
+            user = self.scope.get('user')
+            if user is None or not user.is_authenticated:
+                await self.close(code=4403)
+                return
+            self.initialized = True
+            await self.send_json({'type': 'connection_ack'})
+
+        elif message_type == 'ping':
+            await self.send_json({'type': 'pong'})
+
+        elif message_type == 'pong':
+            pass
+
+        elif message_type == 'subscribe':
+            if not self.initialized:
+                await self.close(code=4401)
+                return
+            operation_id = message.get('id')
+            if operation_id in self.operations:
+                await self.close(code=4409)
+                return
+            self.operations[operation_id] = asyncio.ensure_future(
+                self.run_operation(operation_id, message.get('payload') or {})
+            )
+
+        elif message_type == 'complete':
+            task = self.operations.pop(message.get('id'), None)
+            if task is not None:
+                task.cancel()
+
+        else:
+            await self.close(code=4400)
+
+    async def run_operation(self, operation_id, payload):
+        """
+        Execute one subscription and forward every event to the client.
+        """
+        from .schema import schema
+
+        try:
+            document = parse(payload.get('query', ''))
+            errors = validate(schema.graphql_schema, document)
+            if errors:
+                await self.send_json({
+                    'type': 'error',
+                    'id': operation_id,
+                    'payload': [error.formatted for error in errors],
+                })
+                return
+
+            result = await subscribe(
+                schema.graphql_schema,
+                document,
+                context_value=self.scope,
+                variable_values=payload.get('variables'),
+                operation_name=payload.get('operationName'),
+            )
+            # Queries and failed subscriptions return a single result
+            if not hasattr(result, '__aiter__'):
+                await self.send_json({'type': 'next', 'id': operation_id, 'payload': result.formatted})
+            else:
+                try:
+                    async for event in result:
+                        await self.send_json({'type': 'next', 'id': operation_id, 'payload': event.formatted})
+                finally:
+                    await result.aclose()
+
+            await self.send_json({'type': 'complete', 'id': operation_id})
+
+        except asyncio.CancelledError:
+            raise
+        except GraphQLError as e:
+            await self.send_json({'type': 'error', 'id': operation_id, 'payload': [e.formatted]})
+        except Exception as e:
+            logger.error(f"Subscription {operation_id} failed: {str(e)}")
+            await self.send_json({'type': 'error', 'id': operation_id, 'payload': [{'message': str(e)}]})
+        finally:
+            self.operations.pop(operation_id, None)
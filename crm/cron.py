@@ -1,18 +1,20 @@
 """
-Django-crontab heartbeat logger for CRM application health monitoring.
+Django-crontab jobs for CRM application health monitoring and restocking.
+
+run_scheduled_jobs is the only crontab entry: it runs the heartbeat and
+low-stock jobs due on each tick in one batched GraphQL request.
 """
 
 import os
 from datetime import datetime
-from gql import gql, Client
-from gql.transport.requests import RequestsHTTPTransport
+from .client import execute_batch
+from .connections import get_crm_setting, reset_http_session
+from .queries import HELLO_QUERY, UPDATE_LOW_STOCK_MUTATION
 
 
-def log_crm_heartbeat():
+def write_heartbeat(graphql_status):
     """
-    Log heartbeat message to confirm CRM application health.
-    Format: DD/MM/YYYY-HH:MM:SS CRM is alive
-    Also optionally queries GraphQL hello field to verify endpoint responsiveness.
+    Append the heartbeat line for the given hello response (None if unresponsive).
     """
     # Generate timestamp in DD/MM/YYYY-HH:MM:SS format
     timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
@@ -20,8 +22,6 @@ def log_crm_heartbeat():
     # Base heartbeat message
     heartbeat_message = f"{timestamp} CRM is alive"
     
-    # Optional GraphQL health check
-    graphql_status = check_graphql_endpoint()
     if graphql_status:
         heartbeat_message += f" - GraphQL endpoint responsive: {graphql_status}"
     else:
@@ -36,62 +36,11 @@ def log_crm_heartbeat():
         print(f"Error writing heartbeat log: {e}")
 
 
-def check_graphql_endpoint():
-    """
-    Query GraphQL hello field to verify endpoint responsiveness.
-    Returns the hello message if successful, None if failed.
-    """
-    try:
-        # GraphQL endpoint
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        
-        # Simple hello query
-        query = gql("""
-            query {
-                hello
-            }
-        """)
-        
-        # Execute the query
-        result = client.execute(query)
-        return result.get("hello", "Unknown response")
-        
-    except Exception as e:
-        # Return None if GraphQL query fails
-        return None
-
-
-def update_low_stock():
+def write_low_stock_result(mutation_result):
     """
-    Execute GraphQL mutation to update low-stock products (stock < 10)
-    and log the updates to file.
+    Append the outcome of an updateLowStockProducts mutation to the log file.
     """
     try:
-        # GraphQL endpoint
-        transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        
-        # GraphQL mutation for updating low-stock products
-        mutation = gql("""
-            mutation {
-                updateLowStockProducts {
-                    updatedProducts {
-                        id
-                        name
-                        stock
-                    }
-                    success
-                    message
-                    updatedCount
-                }
-            }
-        """)
-        
-        # Execute the mutation
-        result = client.execute(mutation)
-        mutation_result = result.get("updateLowStockProducts", {})
-        
         # Generate timestamp
         timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
         
@@ -118,12 +67,73 @@ def update_low_stock():
             log_file.write(log_entry)
             
     except Exception as e:
-        # Log error if mutation fails
-        timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
-        error_entry = f"[{timestamp}] Low Stock Update Error: {str(e)}\n"
-        
-        try:
-            with open("/tmp/low_stock_updates_log.txt", "a") as log_file:
-                log_file.write(error_entry)
-        except:
-            print(f"Error logging low stock update failure: {e}")
+        write_low_stock_error(e)
+
+
+def write_low_stock_error(error):
+    """
+    Append a low-stock update failure to the log file.
+    """
+    timestamp = datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
+    error_entry = f"[{timestamp}] Low Stock Update Error: {str(error)}\n"
+    
+    try:
+        with open("/tmp/low_stock_updates_log.txt", "a") as log_file:
+            log_file.write(error_entry)
+    except:
+        print(f"Error logging low stock update failure: {error}")
+
+
+# Jobs dispatched by run_scheduled_jobs: interval in minutes (a multiple of
+# the 5 minute dispatcher tick), overridable via CRM_SETTINGS['CRON_JOB_INTERVALS']
+DEFAULT_JOB_INTERVALS = {
+    'heartbeat': 5,
+    'low_stock': 720,
+}
+DISPATCH_TICK_MINUTES = 5
+
+
+def get_due_jobs(now):
+    """
+    Return the names of jobs whose interval falls on the current tick.
+    """
+    intervals = get_crm_setting('CRON_JOB_INTERVALS', DEFAULT_JOB_INTERVALS)
+    minute_of_day = now.hour * 60 + now.minute
+    tick = minute_of_day - minute_of_day % DISPATCH_TICK_MINUTES
+    return [name for name, interval in intervals.items() if tick % interval == 0]
+
+
+def run_scheduled_jobs():
+    """
+    Run every job due on this tick, sending their GraphQL operations
+    together in one batched request instead of one request per job.
+    """
+    operations = {
+        'heartbeat': HELLO_QUERY,
+        'low_stock': UPDATE_LOW_STOCK_MUTATION,
+    }
+    due_jobs = [name for name in get_due_jobs(datetime.now()) if name in operations]
+    if not due_jobs:
+        return
+    
+    try:
+        results = dict(zip(due_jobs, execute_batch([(operations[name], None) for name in due_jobs])))
+    except Exception as e:
+        # Drop the possibly stale session so the next tick reconnects
+        reset_http_session()
+        if 'heartbeat' in due_jobs:
+            write_heartbeat(None)
+        if 'low_stock' in due_jobs:
+            write_low_stock_error(e)
+        return
+    
+    if 'heartbeat' in results:
+        hello_data = results['heartbeat'].get("data") or {}
+        write_heartbeat(hello_data.get("hello"))
+    
+    if 'low_stock' in results:
+        restock_result = results['low_stock']
+        if restock_result.get("errors"):
+            write_low_stock_error(restock_result["errors"][0].get("message", "Unknown error"))
+        else:
+            write_low_stock_result((restock_result.get("data") or {}).get("updateLowStockProducts", {}))
@@ -2,27 +2,59 @@
 """
 GraphQL-based Order Reminder Script
 Queries pending orders from the last 7 days and logs reminders.
+
+Each run only fetches orders placed since the last processed watermark.
+A persisted per-order ledger deduplicates reminders, and orders already
+reminded are only reminded again once the reminder cadence has elapsed.
 """
 
 import sys
 import os
+import json
 from datetime import datetime, timedelta
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 
-def get_pending_orders():
+# Reminder window and ledger configuration
+REMINDER_WINDOW_DAYS = 7
+STATE_FILE_PATH = os.environ.get(
+    "ORDER_REMINDER_STATE_PATH", "/tmp/order_reminders_state.json"
+)
+# Days between repeated reminders for the same order (0 = remind only once)
+REMINDER_CADENCE_DAYS = int(os.environ.get("ORDER_REMINDER_CADENCE_DAYS", "0"))
+
+def load_reminder_state():
+    """
+    Load the persisted watermark and per-order reminder ledger
+    """
+    try:
+        with open(STATE_FILE_PATH) as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        state = {}
+
+    state.setdefault("watermark", None)
+    state.setdefault("ledger", {})
+    return state
+
+def save_reminder_state(state):
     """
-    Query GraphQL endpoint for orders with order_date within the last 7 days
+    Persist the watermark and ledger atomically
+    """
+    temp_path = f"{STATE_FILE_PATH}.tmp"
+    with open(temp_path, "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_path, STATE_FILE_PATH)
+
+def get_pending_orders(date_filter):
+    """
+    Query GraphQL endpoint for orders with order_date on or after date_filter
     """
     # GraphQL endpoint
     transport = RequestsHTTPTransport(url="http://localhost:8000/graphql")
     client = Client(transport=transport, fetch_schema_from_transport=True)
-    
-    # Calculate date 7 days ago
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    date_filter = seven_days_ago.strftime("%Y-%m-%d")
-    
-    # GraphQL query for pending orders within last 7 days
+
+    # GraphQL query for pending orders since the given date
     query = gql("""
         query GetPendingOrders($dateFilter: String!) {
             orders(filters: { orderDate_Gte: $dateFilter }) {
@@ -34,14 +66,29 @@ def get_pending_orders():
             }
         }
     """)
-    
+
     try:
         # Execute the query
         result = client.execute(query, variable_values={"dateFilter": date_filter})
         return result.get("orders", [])
     except Exception as e:
         print(f"Error querying GraphQL endpoint: {e}")
-        return []
+        return None
+
+def get_due_order_ids(ledger, now, window_start):
+    """
+    Return ids of reminded orders whose next reminder is due under the cadence
+    """
+    if REMINDER_CADENCE_DAYS <= 0:
+        return set()
+
+    # Compare calendar days, so a run starting a few seconds earlier than
+    # the previous one does not push the repeat back by a whole day
+    due_on = (now - timedelta(days=REMINDER_CADENCE_DAYS)).strftime("%Y-%m-%d")
+    return {
+        order_id for order_id, entry in ledger.items()
+        if entry["order_date"][:10] >= window_start and entry["last_reminded"][:10] <= due_on
+    }
 
 def log_order_reminder(order_id, customer_email):
     """
@@ -49,7 +96,7 @@ def log_order_reminder(order_id, customer_email):
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] Order ID: {order_id}, Customer Email: {customer_email}\n"
-    
+
     try:
         with open("/tmp/order_reminders_log.txt", "a") as log_file:
             log_file.write(log_entry)
@@ -61,25 +108,59 @@ def main():
     Main function to process order reminders
     """
     try:
-        # Get pending orders from GraphQL
-        pending_orders = get_pending_orders()
-        
+        now = datetime.now()
+        window_start = (now - timedelta(days=REMINDER_WINDOW_DAYS)).strftime("%Y-%m-%d")
+        state = load_reminder_state()
+        ledger = state["ledger"]
+
+        # Only fetch orders placed since the watermark (never before the window).
+        # Repeat reminders widen the fetch to the whole window, so only orders
+        # the server still returns get reminded again.
+        due_order_ids = get_due_order_ids(ledger, now, window_start)
+        if due_order_ids:
+            date_filter = window_start
+        else:
+            date_filter = max(filter(None, [state["watermark"], window_start]))
+        new_orders = get_pending_orders(date_filter)
+        if new_orders is None:
+            sys.exit(1)
+
+        # Skip orders already in the ledger unless their repeat is due
+        pending_orders = [
+            order for order in new_orders
+            if str(order.get("id")) not in ledger or str(order.get("id")) in due_order_ids
+        ]
+
         if not pending_orders:
-            print("No pending orders found within the last 7 days.")
-            return
-        
+            print("No new pending orders to remind.")
+
         # Process each order
+        reminded_at = now.strftime("%Y-%m-%d %H:%M:%S")
         for order in pending_orders:
             order_id = order.get("id")
             customer_email = order.get("customer", {}).get("email")
-            
+
             if order_id and customer_email:
                 log_order_reminder(order_id, customer_email)
+                ledger[str(order_id)] = {
+                    "order_date": order.get("orderDate") or window_start,
+                    "email": customer_email,
+                    "last_reminded": reminded_at,
+                }
             else:
                 print(f"Warning: Incomplete order data for order {order_id}")
-        
+
+        # Advance the watermark and drop ledger entries outside the window
+        order_dates = [str(order["orderDate"])[:10] for order in new_orders if order.get("orderDate")]
+        state["watermark"] = max(order_dates + list(filter(None, [state["watermark"], date_filter])))
+        state["ledger"] = {
+            order_id: entry for order_id, entry in ledger.items()
+            if entry["order_date"][:10] >= window_start
+        }
+        save_reminder_state(state)
+
         print("Order reminders processed!")
-        
+
     except Exception as e:
         print(f"Error processing order reminders: {e}")
         sys.exit(1)
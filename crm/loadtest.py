@@ -0,0 +1,240 @@
+"""
+HTTP load-test harness for the CRM GraphQL endpoint.
+
+Drives the operations our jobs send from a pool of threads, either
+closed-loop or open-loop at a target request rate, and summarises
+throughput, latency percentiles and error rates. Used by the ``loadtest_graphql`` management command.
+"""
+
+import asyncio
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import requests
+from .queries import (
+    CRM_REPORT_QUERY,
+    HELLO_QUERY,
+    PENDING_ORDERS_QUERY,
+    UPDATE_LOW_STOCK_MUTATION,
+)
+
+
+def pending_orders_variables():
+    """
+    Variables sent by the order reminder script (orders from the last 7 days).
+    """
+    return {"dateFilter": (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")}
+
+
+# Operation name -> (document, variables factory)
+OPERATIONS = {
+    'hello': (HELLO_QUERY, None),
+    'update_low_stock': (UPDATE_LOW_STOCK_MUTATION, None),
+    'pending_orders': (PENDING_ORDERS_QUERY, pending_orders_variables),
+    'report': (CRM_REPORT_QUERY, None),
+}
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LoadTestResults:
+    """
+    Thread-safe collector of per-operation latencies and errors.
+    """
+
+    def __init__(self, operations):
+        self._lock = threading.Lock()
+        self.latencies = {name: [] for name in operations}
+        self.errors = {name: 0 for name in operations}
+        self.error_samples = []
+
+    def record(self, operation, latency, error=None):
+        with self._lock:
+            self.latencies[operation].append(latency)
+            if error is not None:
+                self.errors[operation] += 1
+                if len(self.error_samples) < 10:
+                    self.error_samples.append(f"{operation}: {error}")
+
+    def summary(self, elapsed, config):
+        """
+        Build the JSON-serializable report.
+        """
+        def summarize(latencies, errors):
+            ordered = sorted(latencies)
+            count = len(ordered)
+            return {
+                'requests': count,
+                'errors': errors,
+                'error_rate': round(errors / count, 4) if count else 0.0,
+                'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+                'latency_ms': {
+                    'mean': round(sum(ordered) / count * 1000, 2) if count else None,
+                    'p50': _ms(percentile(ordered, 50)),
+                    'p95': _ms(percentile(ordered, 95)),
+                    'p99': _ms(percentile(ordered, 99)),
+                    'max': _ms(ordered[-1] if ordered else None),
+                },
+            }
+
+        with self._lock:
+            all_latencies = list(itertools.chain.from_iterable(self.latencies.values()))
+            return {
+                'config': config,
+                'elapsed_seconds': round(elapsed, 3),
+                'total': summarize(all_latencies, sum(self.errors.values())),
+                'operations': {
+                    name: summarize(self.latencies[name], self.errors[name])
+                    for name in self.latencies
+                },
+                'error_samples': list(self.error_samples),
+            }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class GraphQLLoadTest:
+    """
+    Send a round-robin mix of GraphQL operations to ``url``.
+
+    ``mode='thread'`` runs ``concurrency`` closed-loop workers that share the
+    target ``rate`` (requests/second, 0 = as fast as possible).
+    ``mode='open_loop'`` schedules requests at ``rate`` from an asyncio event
+    loop regardless of how fast responses come back, and hands them to a pool
+    of ``concurrency`` threads (the HTTP client is blocking).
+
+    Latency is measured from each request's scheduled send time, so time
+    spent waiting for a free worker counts towards the percentiles instead
+    of being hidden (coordinated omission).
+    """
+
+    def __init__(self, url, operations=None, concurrency=10, rate=0,
+                 duration=10.0, mode='thread', timeout=30.0):
+        operations = list(operations or OPERATIONS)
+        unknown = [name for name in operations if name not in OPERATIONS]
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(unknown)}")
+        if mode not in ('thread', 'open_loop'):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode == 'open_loop' and rate <= 0:
+            raise ValueError("open_loop mode needs a target rate")
+
+        self.url = url
+        self.operations = operations
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.mode = mode
+        self.timeout = timeout
+        self.results = LoadTestResults(operations)
+        self._sessions = threading.local()
+        self._op_cycle = itertools.cycle(operations)
+        self._op_lock = threading.Lock()
+
+    def _next_operation(self):
+        with self._op_lock:
+            return next(self._op_cycle)
+
+    def _session(self):
+        # One keep-alive HTTP session per worker thread
+        session = getattr(self._sessions, 'session', None)
+        if session is None:
+            session = self._sessions.session = requests.Session()
+        return session
+
+    def send(self, operation, scheduled_at=None):
+        """
+        Execute one operation and record its latency and outcome.
+        ``scheduled_at`` is the perf_counter() time the request was due to be
+        sent; latency is measured from it when given.
+        """
+        document, variables_factory = OPERATIONS[operation]
+        payload = {'query': document}
+        if variables_factory is not None:
+            payload['variables'] = variables_factory()
+
+        error = None
+        start = time.perf_counter() if scheduled_at is None else scheduled_at
+        try:
+            response = self._session().post(self.url, json=payload, timeout=self.timeout)
+            if response.status_code != 200:
+                error = f"HTTP {response.status_code}"
+            else:
+                body = response.json()
+                if body.get('errors'):
+                    error = body['errors'][0].get('message', 'GraphQL error')
+        except Exception as e:
+            error = str(e)
+        self.results.record(operation, time.perf_counter() - start, error)
+
+    def _thread_worker(self, deadline, interval):
+        next_send = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            if interval and now < next_send:
+                time.sleep(min(next_send - now, deadline - now))
+                continue
+            scheduled_at = next_send if interval else None
+            next_send += interval
+            self.send(self._next_operation(), scheduled_at)
+
+    def _run_threads(self):
+        # Each worker paces itself to its share of the target rate
+        interval = self.concurrency / self.rate if self.rate > 0 else 0
+        deadline = time.perf_counter() + self.duration
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for _ in range(self.concurrency):
+                executor.submit(self._thread_worker, deadline, interval)
+
+    async def _run_open_loop(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.rate
+        total = int(self.duration * self.rate)
+        start = time.perf_counter()
+        pending = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for index in range(total):
+                scheduled_at = start + index * interval
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                pending.append(loop.run_in_executor(
+                    executor, self.send, self._next_operation(), scheduled_at
+                ))
+            await asyncio.gather(*pending)
+
+    def run(self):
+        """
+        Run the load test and return the JSON-serializable summary.
+        """
+        start = time.perf_counter()
+        if self.mode == 'open_loop':
+            asyncio.run(self._run_open_loop())
+        else:
+            self._run_threads()
+        elapsed = time.perf_counter() - start
+
+        config = {
+            'url': self.url,
+            'operations': self.operations,
+            'mode': self.mode,
+            'concurrency': self.concurrency,
+            'target_rps': self.rate,
+            'duration_seconds': self.duration,
+        }
+        return self.results.summary(elapsed, config)
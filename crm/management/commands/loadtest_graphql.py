@@ -0,0 +1,135 @@
+"""
+Load-test the GraphQL endpoint and report latency percentiles as JSON.
+
+By default a local Django test server is started against a freshly created
+and seeded SQLite database; pass --url to target an already running server.
+"""
+
+import json
+import os
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.testcases import LiveServerThread
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from crm.loadtest import OPERATIONS, GraphQLLoadTest
+
+
+class Command(BaseCommand):
+    help = "Load-test the GraphQL endpoint and print throughput and latency percentiles as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Target an existing GraphQL endpoint instead of a local test server")
+        parser.add_argument('--path', default='/graphql', help="GraphQL path on the local test server")
+        parser.add_argument(
+            '--operations', default=','.join(OPERATIONS),
+            help=f"Comma-separated operations to send round-robin ({', '.join(OPERATIONS)})",
+        )
+        parser.add_argument(
+            '--mode', choices=['thread', 'open_loop'], default='thread',
+            help="thread: closed-loop workers; open_loop: fixed-rate schedule that includes queueing delay",
+        )
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--rate', type=float, default=50.0, help="Target requests per second (0 = unthrottled, thread mode only)")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds to send requests for")
+        parser.add_argument('--customers', type=int, default=200, help="Customers to seed")
+        parser.add_argument('--orders', type=int, default=1000, help="Orders to seed")
+        parser.add_argument('--products', type=int, default=100, help="Products to seed")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, **options):
+        operations = [name.strip() for name in options['operations'].split(',') if name.strip()]
+
+        def run_load_test(url):
+            try:
+                load_test = GraphQLLoadTest(
+                    url,
+                    operations=operations,
+                    concurrency=options['concurrency'],
+                    rate=options['rate'],
+                    duration=options['duration'],
+                    mode=options['mode'],
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            return load_test.run()
+
+        if options['url']:
+            report = run_load_test(options['url'])
+        else:
+            report = self.run_against_test_server(options, run_load_test)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + "\n")
+            self.stdout.write(f"Load test report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def run_against_test_server(self, options, run_load_test):
+        """
+        Create and seed a temporary SQLite database, serve it from a live
+        test server thread and run the load test against it.
+        """
+        if connection.vendor != 'sqlite':
+            raise CommandError("The local test server requires a SQLite database; use --url otherwise")
+
+        # File-backed so the server's request threads share one database
+        db_fd, db_path = tempfile.mkstemp(prefix='crm_loadtest_', suffix='.sqlite3')
+        os.close(db_fd)
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = db_path
+        old_name = connection.settings_dict['NAME']
+
+        setup_test_environment()
+        try:
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            self.seed_database(options['customers'], options['orders'], options['products'])
+
+            host = 'localhost'
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, host]):
+                server = LiveServerThread(host, static_handler=lambda handler: handler)
+                server.daemon = True
+                server.start()
+                server.is_ready.wait()
+                if server.error:
+                    raise CommandError(f"Test server failed to start: {server.error}")
+
+                try:
+                    return run_load_test(f"http://{host}:{server.port}{options['path']}")
+                finally:
+                    server.terminate()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+    def seed_database(self, customer_count, order_count, product_count):
+        """
+        Populate the test database with customers, orders and products.
+        """
+        try:
+            from crm.models import Customer, Order, Product
+        except ImportError:
+            # If models are in separate apps, try importing from there
+            from crm.models import Product
+            from customers.models import Customer
+            from orders.models import Order
+
+        # Half of the products start below the low-stock threshold
+        Product.objects.bulk_create(
+            Product(name=f"Product {i}", stock=i % 20)
+            for i in range(product_count)
+        )
+
+        customers = Customer.objects.bulk_create(
+            Customer(name=f"Customer {i}", email=f"customer{i}@example.com")
+            for i in range(customer_count)
+        )
+        if customers:
+            Order.objects.bulk_create(
+                Order(customer=customers[i % len(customers)], totalamount=10 + i % 90)
+                for i in range(order_count)
+            )
@@ -0,0 +1,61 @@
+"""
+Fixed GraphQL documents sent by CRM jobs and scripts.
+"""
+
+# Heartbeat check (heartbeat job in crm.cron.run_scheduled_jobs)
+HELLO_QUERY = """
+    query {
+        hello
+    }
+"""
+
+# Low-stock restock (low_stock job in crm.cron.run_scheduled_jobs)
+UPDATE_LOW_STOCK_MUTATION = """
+    mutation {
+        updateLowStockProducts {
+            updatedProducts {
+                id
+                name
+                stock
+            }
+            success
+            message
+            updatedCount
+        }
+    }
+"""
+
+# Pending orders (crm/cron_jobs/send_order_reminders.py)
+PENDING_ORDERS_QUERY = """
+    query GetPendingOrders($dateFilter: String!) {
+        orders(filters: { orderDate_Gte: $dateFilter }) {
+            id
+            orderDate
+            customer {
+                email
+            }
+        }
+    }
+"""
+
+# Weekly report (crm.tasks.generate_crm_report)
+CRM_REPORT_QUERY = """
+    query {
+        customers {
+            edges {
+                node {
+                    id
+                    name
+                }
+            }
+        }
+        orders {
+            edges {
+                node {
+                    id
+                    totalamount
+                }
+            }
+        }
+    }
+"""
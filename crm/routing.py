@@ -0,0 +1,10 @@
+"""
+WebSocket URL patterns for GraphQL subscriptions.
+"""
+
+from django.urls import path
+from .consumers import GraphQLSubscriptionConsumer
+
+websocket_urlpatterns = [
+    path('graphql/subscriptions', GraphQLSubscriptionConsumer.as_asgi()),
+]
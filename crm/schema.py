@@ -3,9 +3,13 @@ GraphQL Schema for CRM Application
 """
 
 import graphene
+from channels.db import database_sync_to_async
 from graphene_django import DjangoObjectType
 from django.db import transaction
+from graphql import GraphQLError
 from .models import Product
+from .signals import get_order_model
+from .subscriptions import LOW_STOCK_GROUP, ORDERS_GROUP, listen
 
 
 class ProductType(DjangoObjectType):
@@ -42,6 +46,10 @@ class UpdateLowStockProducts(graphene.Mutation):
                 
                 # Update each low-stock product
                 for product in low_stock_products:
+                    # Pass the known stock on to the low-stock signal, so the
+                    # save does not look it up again
+                    product._previous_stock = product.stock
+                    
                     # Increment stock by 10
                     product.stock += 10
                     product.save()
@@ -74,4 +82,59 @@ class Mutation(graphene.ObjectType):
     update_low_stock_products = UpdateLowStockProducts.Field()
 
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
+class LowStockChange(graphene.ObjectType):
+    """
+    Delta for a product entering, leaving or moving within low stock
+    """
+    id = graphene.ID()
+    name = graphene.String()
+    stock = graphene.Int()
+    previous_stock = graphene.Int()
+    low_stock = graphene.Boolean()
+
+
+class OrderCreated(graphene.ObjectType):
+    """
+    Delta for a newly created order
+    """
+    id = graphene.ID()
+    customer_id = graphene.ID()
+    total_amount = graphene.Float()
+    order_date = graphene.String()
+
+
+async def check_view_permission(info, model):
+    """
+    Raise unless the subscribing user may view the model's records
+    (the same permission the export views require)
+    """
+    if model is None:
+        raise GraphQLError("Model is not installed")
+    
+    permission = f"{model._meta.app_label}.view_{model._meta.model_name}"
+    user = info.context.get('user')
+    if user is None or not user.is_authenticated:
+        raise GraphQLError("Authentication required")
+    if not await database_sync_to_async(user.has_perm)(permission):
+        raise GraphQLError(f"Missing permission: {permission}")
+
+
+class Subscription(graphene.ObjectType):
+    """
+    Push-based events delivered over WebSockets (see crm/consumers.py)
+    """
+    low_stock_changed = graphene.Field(LowStockChange)
+    order_created = graphene.Field(OrderCreated)
+    
+    async def subscribe_low_stock_changed(root, info):
+        await check_view_permission(info, Product)
+        async for message in listen(LOW_STOCK_GROUP):
+            yield message
+    
+    async def subscribe_order_created(root, info):
+        await check_view_permission(info, get_order_model())
+        async for message in listen(ORDERS_GROUP):
+            yield message
+
+
+schema = graphene.Schema(query=Query, mutation=Mutation, subscription=Subscription)
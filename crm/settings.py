@@ -2,6 +2,7 @@
 
 # First, make sure to add django_celery_beat to INSTALLED_APPS
 INSTALLED_APPS = [
+    'daphne',  # ASGI server for GraphQL subscriptions
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -11,9 +12,27 @@ INSTALLED_APPS = [
     'graphene_django',
     'django_crontab',
     'django_celery_beat',  # Add this line
+    'channels',
     'crm',
 ]
 
+# ASGI and Channels configuration for GraphQL subscriptions
+ASGI_APPLICATION = 'crm.asgi.application'
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            'hosts': ['redis://localhost:6379/1'],
+        },
+    },
+}
+
+# Cron jobs: one dispatcher batches the GraphQL calls of every job due on a tick
+CRONJOBS = [
+    ('*/5 * * * *', 'crm.cron.run_scheduled_jobs'),
+]
+
 # Celery Configuration
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
@@ -49,6 +68,13 @@ CRM_SETTINGS = {
     'ORDER_REMINDER_LOG_PATH': '/tmp/order_reminders_log.txt',
     'GRAPHQL_ENDPOINT': 'http://localhost:8000/graphql',
     'CRM_REPORT_LOG_PATH': '/tmp/crm_report_log.txt',  # Add this line
+    # Persistent worker connections (see crm/connections.py)
+    'DB_CONN_MAX_AGE': 600,  # Seconds before a DB connection is recycled
+    'DB_CONN_HEALTH_CHECKS': True,
+    # Import the schema and precompile fixed queries before forking workers
+    'WORKER_PREFORK_WARMUP': True,
+    # Minutes between runs of each job dispatched by crm.cron.run_scheduled_jobs
+    'CRON_JOB_INTERVALS': {'heartbeat': 5, 'low_stock': 720},
 }
 
 # Add celery to your existing LOGGING configuration
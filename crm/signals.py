@@ -0,0 +1,94 @@
+"""
+Model signal handlers that publish subscription deltas.
+"""
+
+from functools import partial
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from .subscriptions import LOW_STOCK_GROUP, ORDERS_GROUP, publish
+
+LOW_STOCK_THRESHOLD = 10
+
+
+def get_order_model():
+    """
+    Return the Order model, whether it lives in crm or a separate orders app.
+    """
+    for app_label in ('crm', 'orders'):
+        try:
+            return apps.get_model(app_label, 'Order')
+        except LookupError:
+            continue
+    return None
+
+
+def remember_stock(sender, instance, update_fields=None, **kwargs):
+    """
+    Look up the stored stock before a save so it can be compared afterwards.
+    Skipped when the caller already set instance._previous_stock (as the
+    restock mutation does) or when the save leaves stock out of update_fields.
+    """
+    if update_fields is not None and 'stock' not in update_fields:
+        return
+    if hasattr(instance, '_previous_stock') or instance.pk is None:
+        return
+    instance._previous_stock = (
+        sender.objects.filter(pk=instance.pk).values_list('stock', flat=True).first()
+    )
+
+
+def publish_low_stock_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Publish a delta when a product enters, leaves or moves within low stock.
+    """
+    # Consume the remembered value so a later save of this instance looks it up again
+    previous_stock = instance.__dict__.pop('_previous_stock', None)
+    if update_fields is not None and 'stock' not in update_fields:
+        return
+    if created:
+        previous_stock = None
+    stock = instance.stock
+    was_low = previous_stock is not None and previous_stock < LOW_STOCK_THRESHOLD
+    is_low = stock < LOW_STOCK_THRESHOLD
+
+    if stock != previous_stock and (was_low or is_low):
+        message = {
+            'id': instance.pk,
+            'name': getattr(instance, 'name', None),
+            'stock': stock,
+            'previous_stock': previous_stock,
+            'low_stock': is_low,
+        }
+        transaction.on_commit(partial(publish, LOW_STOCK_GROUP, message))
+
+
+def publish_order_created(sender, instance, created, **kwargs):
+    """
+    Publish newly created orders.
+    """
+    if not created:
+        return
+
+    total_amount = getattr(instance, 'totalamount', getattr(instance, 'total_amount', None))
+    order_date = getattr(instance, 'order_date', getattr(instance, 'orderdate', None))
+    message = {
+        'id': instance.pk,
+        'customer_id': getattr(instance, 'customer_id', None),
+        'total_amount': float(total_amount) if total_amount is not None else None,
+        'order_date': order_date.isoformat() if order_date is not None else None,
+    }
+    transaction.on_commit(partial(publish, ORDERS_GROUP, message))
+
+
+def connect_signals():
+    """
+    Connect the subscription publishers to the CRM models.
+    """
+    Product = apps.get_model('crm', 'Product')
+    pre_save.connect(remember_stock, sender=Product, dispatch_uid='crm_remember_stock')
+    post_save.connect(publish_low_stock_change, sender=Product, dispatch_uid='crm_low_stock_changed')
+
+    Order = get_order_model()
+    if Order is not None:
+        post_save.connect(publish_order_created, sender=Order, dispatch_uid='crm_order_created')
@@ -0,0 +1,50 @@
+"""
+Publishing and receiving GraphQL subscription events over the Channels layer.
+
+Model signals publish small delta messages to a group; subscription
+resolvers listen to the group, so subscribers never re-scan the tables.
+The layer comes from CHANNEL_LAYERS: channels_redis in production,
+channels.layers.InMemoryChannelLayer for tests.
+"""
+
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+LOW_STOCK_GROUP = 'crm.low_stock'
+ORDERS_GROUP = 'crm.orders'
+
+EVENT_TYPE = 'crm.event'
+
+
+def publish(group, message):
+    """
+    Send a delta to every subscriber of the group.
+    Logs instead of raising so model saves never fail on it.
+    """
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(group, {'type': EVENT_TYPE, 'payload': message})
+    except Exception as e:
+        logger.error(f"Error publishing subscription event to {group}: {str(e)}")
+
+
+async def listen(group):
+    """
+    Yield the deltas published to the group until the subscriber goes away.
+    """
+    channel_layer = get_channel_layer()
+    channel_name = await channel_layer.new_channel()
+    await channel_layer.group_add(group, channel_name)
+    try:
+        while True:
+            message = await channel_layer.receive(channel_name)
+            if message.get('type') == EVENT_TYPE:
+                yield message['payload']
+    finally:
+        await channel_layer.group_discard(group, channel_name)
@@ -12,6 +12,22 @@ from django.conf import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@shared_task
+def worker_connection_stats():
+    """
+    Return the connection reuse counters of the worker process running this task.
+    """
+    from .connections import get_connection_stats
+    return get_connection_stats()
+
+@shared_task
+def worker_warmup_stats():
+    """
+    Return the warm-up, memory and first-task latency figures of the worker process running this task.
+    """
+    from .warmup import get_warmup_stats
+    return get_warmup_stats()
+
 @shared_task
 def generate_crm_report():
     """
@@ -21,36 +37,24 @@ def generate_crm_report():
     try:
         # Import schema here to avoid circular imports
         from .schema import schema
+        from .queries import CRM_REPORT_QUERY
+        from .warmup import get_document
+        from graphql import execute_sync
         
         # GraphQL query to fetch CRM statistics
-        query = """
-        query {
-            customers {
-                edges {
-                    node {
-                        id
-                        name
-                    }
-                }
-            }
-            orders {
-                edges {
-                    node {
-                        id
-                        totalamount
-                    }
-                }
-            }
-        }
-        """
+        query = CRM_REPORT_QUERY
         
         # Create a request context for GraphQL
         request_factory = RequestFactory()
         request = request_factory.post('/graphql/')
         request.user = AnonymousUser()
         
-        # Execute the GraphQL query
-        result = schema.execute(query, context=request)
+        # Execute the GraphQL query, reusing the document precompiled before fork
+        document = get_document(query)
+        if document is not None:
+            result = execute_sync(schema.graphql_schema, document, context_value=request)
+        else:
+            result = schema.execute(query, context=request)
         
         if result.errors:
             logger.error(f"GraphQL query errors: {result.errors}")
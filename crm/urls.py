@@ -0,0 +1,16 @@
+"""
+URL patterns for the CRM GraphQL and export endpoints.
+Include in the project urls with: path('', include('crm.urls'))
+"""
+
+from django.urls import path
+from django.views.decorators.csrf import csrf_exempt
+from . import views
+from .schema import schema
+
+urlpatterns = [
+    # Accepts single and batched (JSON array) operations
+    path('graphql', csrf_exempt(views.CRMGraphQLView.as_view(graphiql=True, schema=schema)), name='graphql'),
+    path('export/customers/', views.export_customers, name='export-customers'),
+    path('export/orders/', views.export_orders, name='export-orders'),
+]
@@ -0,0 +1,244 @@
+"""
+Views for the CRM application.
+
+CRMGraphQLView accepts single or batched GraphQL operations. The export
+views stream customers and orders as NDJSON or CSV straight from
+QuerySet.iterator(), so exports run in constant server memory regardless
+of table size.
+"""
+
+import csv
+import json
+import zlib
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
+from graphene_django.views import GraphQLView, HttpError
+
+MAX_BATCH_SIZE = 20
+
+DEFAULT_CHUNK_SIZE = 2000
+MAX_CHUNK_SIZE = 20000
+
+# Candidate model fields for the date-range and updated-since filters
+DATE_FIELDS = {
+    'customers': ('created_at',),
+    'orders': ('order_date', 'orderdate', 'created_at'),
+}
+UPDATED_FIELDS = ('updated_at',)
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class CRMGraphQLView(GraphQLView):
+    """
+    GraphQL view accepting either one operation or a JSON array of operations.
+    Batched operations run in order against the same request.
+    """
+
+    max_batch_size = MAX_BATCH_SIZE
+
+    def parse_body(self, request):
+        # Switch to batch mode per request when the JSON body is an array
+        if self.get_content_type(request) == 'application/json':
+            try:
+                body = json.loads(request.body.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError):
+                body = None
+            self.batch = isinstance(body, list)
+            if self.batch and len(body) > self.max_batch_size:
+                raise HttpError(HttpResponseBadRequest(
+                    f"Batch requests are limited to {self.max_batch_size} operations."
+                ))
+        return super().parse_body(request)
+
+
+class Echo:
+    """
+    File-like object that returns what is written, for streaming csv.writer output.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_export_model(name):
+    """
+    Resolve the Customer or Order model, wherever it is defined.
+    """
+    model_name = 'Customer' if name == 'customers' else 'Order'
+    for app_label in ('crm', name):
+        try:
+            return apps.get_model(app_label, model_name)
+        except LookupError:
+            continue
+    raise LookupError(f"No {model_name} model is installed")
+
+
+def find_field(model, candidates):
+    """
+    Return the first candidate field name defined on the model, or None.
+    """
+    for field_name in candidates:
+        try:
+            model._meta.get_field(field_name)
+            return field_name
+        except FieldDoesNotExist:
+            continue
+    return None
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO date or datetime query parameter.
+    """
+    parsed = parse_datetime(value) or parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date: {value}")
+    return parsed
+
+
+def filter_export_queryset(queryset, name, params):
+    """
+    Apply the start/end date-range and updated_since filters from the request.
+    """
+    model = queryset.model
+    filters = {}
+
+    if params.get('start') or params.get('end'):
+        date_field = find_field(model, DATE_FIELDS[name])
+        if date_field is None:
+            raise ValueError(f"{name} cannot be filtered by date")
+        if params.get('start'):
+            filters[f'{date_field}__gte'] = parse_timestamp(params['start'])
+        if params.get('end'):
+            filters[f'{date_field}__lt'] = parse_timestamp(params['end'])
+
+    if params.get('updated_since'):
+        updated_field = find_field(model, UPDATED_FIELDS)
+        if updated_field is None:
+            raise ValueError(f"{name} cannot be filtered by update time")
+        filters[f'{updated_field}__gte'] = parse_timestamp(params['updated_since'])
+
+    return queryset.filter(**filters)
+
+
+def stream_rows(rows, columns, export_format, rows_per_chunk):
+    """
+    Serialize rows and yield them in chunks of rows_per_chunk lines.
+    """
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        serialize = writer.writerow
+        buffer = [writer.writerow(columns)]
+    else:
+        encoder = DjangoJSONEncoder()
+        serialize = lambda row: encoder.encode(dict(zip(columns, row))) + "\n"
+        buffer = []
+
+    for row in rows:
+        buffer.append(serialize(row))
+        if len(buffer) >= rows_per_chunk:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """
+    Gzip-compress a stream of byte chunks incrementally.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(request, name):
+    """
+    Build the streaming export response for customers or orders.
+
+    Query parameters:
+        format: ndjson (default) or csv
+        start, end: ISO dates bounding the record date (end is exclusive)
+        updated_since: ISO date or datetime of the earliest update
+        chunk_size: rows fetched per database round-trip
+        gzip: 1 to gzip the body
+
+    Requires an authenticated user with the model's view permission
+    (e.g. crm.view_customer).
+    """
+    if not request.user.is_authenticated:
+        return HttpResponse("Authentication required", status=401)
+
+    try:
+        model = get_export_model(name)
+    except LookupError as e:
+        return HttpResponse(str(e), status=503)
+
+    permission = f"{model._meta.app_label}.view_{model._meta.model_name}"
+    if not request.user.has_perm(permission):
+        return HttpResponseForbidden(f"Missing permission: {permission}")
+
+    params = request.GET
+    export_format = params.get('format', 'ndjson')
+    if export_format not in CONTENT_TYPES:
+        return HttpResponseBadRequest(f"Unsupported format: {export_format}")
+
+    try:
+        chunk_size = int(params.get('chunk_size', DEFAULT_CHUNK_SIZE))
+    except ValueError:
+        return HttpResponseBadRequest("chunk_size must be an integer")
+    chunk_size = max(1, min(chunk_size, MAX_CHUNK_SIZE))
+
+    try:
+        queryset = filter_export_queryset(model.objects.all(), name, params)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    # Plain column values avoid building model instances per row
+    columns = [field.attname for field in model._meta.concrete_fields]
+    rows = queryset.order_by('pk').values_list(*columns).iterator(chunk_size=chunk_size)
+    body = stream_rows(rows, columns, export_format, chunk_size)
+
+    use_gzip = params.get('gzip') in ('1', 'true')
+    if use_gzip:
+        body = gzip_stream(body)
+
+    response = StreamingHttpResponse(body, content_type=CONTENT_TYPES[export_format])
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    response['Content-Disposition'] = f'attachment; filename="{name}.{extension}"'
+    if use_gzip:
+        response['Content-Encoding'] = 'gzip'
+    return response
+
+
+@require_GET
+def export_customers(request):
+    """
+    Stream all customers as NDJSON or CSV.
+    """
+    return export_response(request, 'customers')
+
+
+@require_GET
+def export_orders(request):
+    """
+    Stream all orders as NDJSON or CSV.
+    """
+    return export_response(request, 'orders')
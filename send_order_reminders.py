@@ -2,22 +2,76 @@
 
 import os
 import sys
+import json
 from datetime import datetime, timedelta
 from gql import gql, Client
 from gql.transport.requests import RequestsHTTPTransport
 
+# Persisted watermark and per-order reminder ledger
+STATE_FILE_PATH = os.environ.get('ORDER_REMINDER_STATE_PATH', '/tmp/pending_order_reminders_state.json')
+
+# Days between repeated reminders for the same order (0 = remind only once)
+REMINDER_CADENCE_DAYS = int(os.environ.get('ORDER_REMINDER_CADENCE_DAYS', '0'))
+
+def load_state():
+    try:
+        with open(STATE_FILE_PATH) as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError):
+        state = {}
+
+    state.setdefault('watermark', None)
+    state.setdefault('ledger', {})
+    return state
+
+def save_state(state):
+    # Write to a temp file first so a crash never leaves a truncated ledger
+    temp_path = f"{STATE_FILE_PATH}.tmp"
+    with open(temp_path, 'w') as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_path, STATE_FILE_PATH)
+
 def main():
     # GraphQL endpoint
     endpoint = "http://localhost:8000/graphql"
-    
+
     # Calculate the date 7 days ago
-    seven_days_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    
+    now = datetime.now()
+    seven_days_ago = (now - timedelta(days=7)).strftime('%Y-%m-%d')
+
+    state = load_state()
+    ledger = state['ledger']
+
+    # Orders already reminded whose next reminder is due under the cadence
+    due_order_ids = set()
+    if REMINDER_CADENCE_DAYS > 0:
+        # Compare calendar days, so a run starting a few seconds earlier than
+        # the previous one does not push the repeat back by a whole day
+        due_on = (now - timedelta(days=REMINDER_CADENCE_DAYS)).strftime('%Y-%m-%d')
+        due_order_ids = {
+            order_id for order_id, entry in ledger.items()
+            if entry['order_date'][:10] >= seven_days_ago and entry['last_reminded'][:10] <= due_on
+        }
+
+    # Only fetch orders placed since the last processed watermark; repeat
+    # reminders widen the fetch to the whole window so that only orders
+    # the server still reports as pending are reminded again.
+    # orderDateAfter excludes its date, so start the day before the
+    # watermark to pick up orders placed later on the watermark day; the
+    # ledger drops the ones already reminded.
+    if due_order_ids:
+        start_date = seven_days_ago
+    elif state['watermark']:
+        day_before_watermark = datetime.strptime(state['watermark'], '%Y-%m-%d') - timedelta(days=1)
+        start_date = max(day_before_watermark.strftime('%Y-%m-%d'), seven_days_ago)
+    else:
+        start_date = seven_days_ago
+
     # Create GraphQL client
     transport = RequestsHTTPTransport(url=endpoint)
     client = Client(transport=transport, fetch_schema_from_transport=True)
-    
-    # GraphQL query to find pending orders within the last 7 days
+
+    # GraphQL query to find pending orders since the start date
     query = gql('''
         query GetPendingOrders($startDate: String!) {
             pendingOrders(orderDateAfter: $startDate) {
@@ -30,38 +84,63 @@ def main():
             }
         }
     ''')
-    
+
     try:
         # Execute the query
-        result = client.execute(query, variable_values={"startDate": seven_days_ago})
-        
+        result = client.execute(query, variable_values={"startDate": start_date})
+
         # Get current timestamp
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # Process the results
-        orders = result.get('pendingOrders', [])
-        
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        # New orders not yet reminded, plus still-pending orders due for a repeat
+        fetched_orders = result.get('pendingOrders', [])
+        orders = [
+            {
+                'id': order['id'],
+                'email': order['customer']['email'],
+                'order_date': order['orderDate'],
+            }
+            for order in fetched_orders
+            if str(order['id']) not in ledger or str(order['id']) in due_order_ids
+        ]
+
         with open('/tmp/order_reminders_log.txt', 'a') as log_file:
             log_file.write(f"[{timestamp}] Processing {len(orders)} pending orders\n")
-            
+
             for order in orders:
                 order_id = order['id']
-                customer_email = order['customer']['email']
-                order_date = order['orderDate']
-                
+                customer_email = order['email']
+                order_date = order['order_date']
+
                 # Log the order reminder
                 log_entry = f"[{timestamp}] Order ID: {order_id}, Customer: {customer_email}, Order Date: {order_date}\n"
                 log_file.write(log_entry)
-        
+
+                # Record the reminder in the ledger
+                ledger[str(order_id)] = {
+                    'email': customer_email,
+                    'order_date': order_date or seven_days_ago,
+                    'last_reminded': timestamp,
+                }
+
+        # Advance the watermark and drop ledger entries outside the 7 day window
+        order_dates = [str(order['orderDate'])[:10] for order in fetched_orders if order.get('orderDate')]
+        state['watermark'] = max(order_dates + list(filter(None, [state['watermark'], start_date])))
+        state['ledger'] = {
+            order_id: entry for order_id, entry in ledger.items()
+            if entry['order_date'][:10] >= seven_days_ago
+        }
+        save_state(state)
+
         # Print success message to console
         print("Order reminders processed!")
-        
+
     except Exception as e:
         # Log any errors
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         with open('/tmp/order_reminders_log.txt', 'a') as log_file:
             log_file.write(f"[{timestamp}] ERROR: {str(e)}\n")
-        
+
         print(f"Error processing order reminders: {str(e)}")
         sys.exit(1)
 